@@ -1,18 +1,18 @@
-from fastapi import FastAPI, Query, HTTPException, BackgroundTasks
+from fastapi import FastAPI, Query, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, validator
 from typing import Optional, List, Dict, Any
-import requests
-from datetime import datetime, timedelta
-import pytz
+from datetime import datetime, timezone as dt_timezone
+from zoneinfo import ZoneInfo
 import os
 import logging
 from dotenv import load_dotenv
 import asyncio
 import aiohttp
 from functools import lru_cache
-import json
+from cachetools import TTLCache
+import orjson
 
 # Load environment variables
 load_dotenv()
@@ -24,9 +24,27 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="Tide Information API",
     description="Comprehensive tide and weather information service",
-    version="2.0.0"
+    version="2.0.0",
+    default_response_class=ORJSONResponse
 )
 
+# Shared HTTP session (created at startup, reused for all upstream calls)
+@app.on_event("startup")
+async def create_http_session():
+    app.state.http = aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(
+            limit=100,
+            limit_per_host=20,
+            keepalive_timeout=75,
+            ttl_dns_cache=300
+        ),
+        timeout=aiohttp.ClientTimeout(total=10)
+    )
+
+@app.on_event("shutdown")
+async def close_http_session():
+    await app.state.http.close()
+
 # CORS setup
 app.add_middleware(
     CORSMiddleware,
@@ -45,8 +63,23 @@ TIDES_API_KEY = os.getenv("WORLD_TIDES_API_KEY")
 WEATHER_API_KEY = os.getenv("OPENWEATHER_API_KEY")
 
 # Cache configuration
-CACHE_DURATION = 1800 
-cache_store = {}
+# Keys are quantized to ~1 km (2 decimal places) so nearby coordinates
+# share entries; TTLCache bounds memory and handles expiry itself.
+CACHE_DURATION = 1800
+tide_cache = TTLCache(maxsize=4096, ttl=CACHE_DURATION)
+weather_cache = TTLCache(maxsize=4096, ttl=CACHE_DURATION)
+
+# In-flight upstream fetches, so concurrent misses on the same key await
+# one shared task instead of issuing duplicate upstream calls
+_inflight: Dict[tuple, asyncio.Task] = {}
+
+# Reject upstream bodies larger than this before reading them
+MAX_UPSTREAM_BYTES = 1 << 20  # 1 MiB
+
+# Per-upstream concurrency caps; sized to stay within the connector's
+# limit_per_host so bursts queue here instead of piling up pending GETs
+_TIDES_SEM = asyncio.Semaphore(10)
+_WEATHER_SEM = asyncio.Semaphore(20)
 
 # Pydantic models for request validation
 class LocationModel(BaseModel):
@@ -77,83 +110,85 @@ class TideResponse(BaseModel):
     last_updated: str
 
 # Utility functions
-def get_cache_key(lat: float, lon: float, data_type: str) -> str:
-    """Generate cache key for API responses"""
-    return f"{data_type}_{lat}_{lon}"
-
-def is_cache_valid(cache_entry: Dict) -> bool:
-    """Check if cache entry is still valid"""
-    if not cache_entry:
-        return False
-    cache_time = datetime.fromisoformat(cache_entry['timestamp'])
-    return (datetime.now() - cache_time).seconds < CACHE_DURATION
-
-@lru_cache(maxsize=100)
+def get_cache_key(lat: float, lon: float) -> tuple:
+    """Generate cache key quantized to ~1 km"""
+    return (round(lat, 2), round(lon, 2))
+
+# Common timezone names for UTC offsets -12..+14, indexed by offset + 12
+_TZ_TABLE = (
+    "Pacific/Auckland", "Pacific/Midway", "Pacific/Honolulu",
+    "America/Anchorage", "America/Los_Angeles", "America/Denver",
+    "America/Chicago", "America/New_York", "America/Halifax",
+    "America/Sao_Paulo", "America/Noronha", "Atlantic/Azores",
+    "UTC", "Europe/London", "Europe/Berlin", "Europe/Moscow",
+    "Asia/Dubai", "Asia/Karachi", "Asia/Dhaka", "Asia/Bangkok",
+    "Asia/Shanghai", "Asia/Tokyo", "Australia/Sydney",
+    "Pacific/Norfolk", "Pacific/Fiji", "Pacific/Tongatapu",
+    "Pacific/Kiritimati"
+)
+
 def get_timezone_from_coords(lat: float, lon: float) -> str:
-    """Get timezone from coordinates (cached for performance)"""
+    """Get approximate timezone from coordinates (longitude-based)"""
+    # int(lon / 15) truncates toward zero, matching the original offset math;
+    # floor division would shift every negative longitude one zone west
+    idx = max(0, min(26, int(lon / 15) + 12))
+    return _TZ_TABLE[idx]
+
+@lru_cache(maxsize=64)
+def _get_tz(name: str) -> ZoneInfo:
+    """Resolve a timezone name, falling back to UTC for unknown names"""
     try:
-        # Simple timezone approximation based on longitude
-        tz_offset = int(lon / 15)
-        if tz_offset < -12:
-            tz_offset = -12
-        elif tz_offset > 14:
-            tz_offset = 14
-        
-        # Map to common timezone names
-        tz_map = {
-            -12: "Pacific/Auckland", -11: "Pacific/Midway", -10: "Pacific/Honolulu",
-            -9: "America/Anchorage", -8: "America/Los_Angeles", -7: "America/Denver",
-            -6: "America/Chicago", -5: "America/New_York", -4: "America/Halifax",
-            -3: "America/Sao_Paulo", -2: "America/Noronha", -1: "Atlantic/Azores",
-            0: "UTC", 1: "Europe/London", 2: "Europe/Berlin", 3: "Europe/Moscow",
-            4: "Asia/Dubai", 5: "Asia/Karachi", 6: "Asia/Dhaka", 7: "Asia/Bangkok",
-            8: "Asia/Shanghai", 9: "Asia/Tokyo", 10: "Australia/Sydney",
-            11: "Pacific/Norfolk", 12: "Pacific/Fiji", 13: "Pacific/Tongatapu",
-            14: "Pacific/Kiritimati"
-        }
-        return tz_map.get(tz_offset, "UTC")
+        return ZoneInfo(name)
     except Exception:
-        return "UTC"
+        return ZoneInfo("UTC")
 
-async def fetch_tide_data(lat: float, lon: float) -> Dict[str, Any]:
+async def fetch_tide_data(lat: float, lon: float, now: datetime) -> Dict[str, Any]:
     """Fetch comprehensive tide data"""
     if not TIDES_API_KEY:
         raise HTTPException(status_code=500, detail="Missing WORLD_TIDES_API_KEY")
     
-    cache_key = get_cache_key(lat, lon, "tides")
-    if cache_key in cache_store and is_cache_valid(cache_store[cache_key]):
-        return cache_store[cache_key]['data']
-    
+    cache_key = get_cache_key(lat, lon)
+    if cache_key in tide_cache:
+        return tide_cache[cache_key]
+
+    # Coalesce concurrent misses for the same coordinate into one fetch
+    inflight_key = ("tides", cache_key)
+    task = _inflight.get(inflight_key)
+    if task is None:
+        task = asyncio.create_task(_fetch_tide_data(lat, lon, cache_key, now))
+        _inflight[inflight_key] = task
+        task.add_done_callback(lambda _: _inflight.pop(inflight_key, None))
+    # Shield the shared task so one cancelled waiter (client disconnect,
+    # sibling failure in a gather) doesn't kill the fetch for everyone
+    return await asyncio.shield(task)
+
+async def _fetch_tide_data(lat: float, lon: float, cache_key: tuple, now: datetime) -> Dict[str, Any]:
+    """Perform the actual WorldTides fetch (one in flight per cache key)"""
     try:
-        # Get current date and next 2 days
-        now = datetime.now()
-        end_date = now + timedelta(days=2)
-        
+        # Only extremes are consumed downstream; omitting "heights" shrinks
+        # the WorldTides payload by roughly an order of magnitude
         params = {
             "extremes": "",
-            "heights": "",
             "lat": lat,
             "lon": lon,
             "key": TIDES_API_KEY,
             "start": int(now.timestamp()),
-            "length": 172800,  # 48 hours in seconds
-            "step": 3600  # 1 hour intervals
+            "length": 172800  # 48 hours in seconds
         }
-        
-        async with aiohttp.ClientSession() as session:
+
+        session = app.state.http
+        async with _TIDES_SEM:
             async with session.get(WORLD_TIDES_API, params=params) as response:
                 if response.status != 200:
                     raise HTTPException(status_code=500, detail="Failed to fetch tide data")
-                data = await response.json()
-        
-        # Cache the response
-        cache_store[cache_key] = {
-            'data': data,
-            'timestamp': datetime.now().isoformat()
-        }
-        
+                if response.content_length and response.content_length > MAX_UPSTREAM_BYTES:
+                    logger.error(f"Tide data response too large: {response.content_length} bytes")
+                    raise HTTPException(status_code=500, detail="Failed to fetch tide data")
+                data = orjson.loads(await response.read())
+
+        tide_cache[cache_key] = data
         return data
-    except aiohttp.ClientError as e:
+    except (aiohttp.ClientError, asyncio.TimeoutError, orjson.JSONDecodeError) as e:
         logger.error(f"Error fetching tide data: {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch tide data")
 
@@ -162,122 +197,181 @@ async def fetch_weather_data(lat: float, lon: float) -> Dict[str, Any]:
     if not WEATHER_API_KEY:
         return {}
     
-    cache_key = get_cache_key(lat, lon, "weather")
-    if cache_key in cache_store and is_cache_valid(cache_store[cache_key]):
-        return cache_store[cache_key]['data']
-    
+    cache_key = get_cache_key(lat, lon)
+    if cache_key in weather_cache:
+        return weather_cache[cache_key]
+
+    # Coalesce concurrent misses for the same coordinate into one fetch
+    inflight_key = ("weather", cache_key)
+    task = _inflight.get(inflight_key)
+    if task is None:
+        task = asyncio.create_task(_fetch_weather_data(lat, lon, cache_key))
+        _inflight[inflight_key] = task
+        task.add_done_callback(lambda _: _inflight.pop(inflight_key, None))
+    # Shield the shared task so one cancelled waiter (client disconnect,
+    # sibling failure in a gather) doesn't kill the fetch for everyone
+    return await asyncio.shield(task)
+
+async def _fetch_weather_data(lat: float, lon: float, cache_key: tuple) -> Dict[str, Any]:
+    """Perform the actual OpenWeather fetches (one in flight per cache key)"""
     try:
-        async with aiohttp.ClientSession() as session:
-            # Current weather
-            current_params = {
-                "lat": lat,
-                "lon": lon,
-                "appid": WEATHER_API_KEY,
-                "units": "metric"
-            }
-            async with session.get(WEATHER_API, params=current_params) as response:
-                current_weather = await response.json() if response.status == 200 else {}
-            
-            # 5-day forecast
-            forecast_params = {
-                "lat": lat,
-                "lon": lon,
-                "appid": WEATHER_API_KEY,
-                "units": "metric",
-                "cnt": 8  # Next 24 hours (3-hour intervals)
-            }
-            async with session.get(WEATHER_FORECAST_API, params=forecast_params) as response:
-                forecast_data = await response.json() if response.status == 200 else {}
-        
+        session = app.state.http
+
+        async def _get(url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+            async with _WEATHER_SEM:
+                async with session.get(url, params=params) as response:
+                    if response.status != 200:
+                        return {}
+                    if response.content_length and response.content_length > MAX_UPSTREAM_BYTES:
+                        logger.error(f"Weather response too large: {response.content_length} bytes")
+                        return {}
+                    return orjson.loads(await response.read())
+
+        current_params = {
+            "lat": lat,
+            "lon": lon,
+            "appid": WEATHER_API_KEY,
+            "units": "metric"
+        }
+        forecast_params = {
+            "lat": lat,
+            "lon": lon,
+            "appid": WEATHER_API_KEY,
+            "units": "metric",
+            "cnt": 8  # Next 24 hours (3-hour intervals)
+        }
+
+        # Current weather and forecast share no data dependency - fetch in parallel
+        current_weather, forecast_data = await asyncio.gather(
+            _get(WEATHER_API, current_params),
+            _get(WEATHER_FORECAST_API, forecast_params)
+        )
+
         weather_info = {
             "current": current_weather,
             "forecast": forecast_data
         }
-        
-        # Cache the response
-        cache_store[cache_key] = {
-            'data': weather_info,
-            'timestamp': datetime.now().isoformat()
-        }
-        
+
+        weather_cache[cache_key] = weather_info
         return weather_info
-    except aiohttp.ClientError as e:
+    except (aiohttp.ClientError, asyncio.TimeoutError, orjson.JSONDecodeError) as e:
         logger.error(f"Error fetching weather data: {e}")
         return {}
 
-def process_tide_data(tide_data: Dict, timezone_str: str) -> Dict[str, Any]:
+def process_tide_data(tide_data: Dict, timezone_str: str, now: datetime) -> Dict[str, Any]:
     """Process and format tide data"""
-    try:
-        user_tz = pytz.timezone(timezone_str)
-    except Exception:
-        user_tz = pytz.UTC
-    
+    user_tz = _get_tz(timezone_str)
+
     processed_data = {
         "next_tides": [],
         "daily_summary": {}
     }
     
     if "extremes" in tide_data:
-        # Process next extremes
-        for tide in tide_data["extremes"][:6]:  # Next 6 tides
+        next_tides = processed_data["next_tides"]
+        high_count = 0
+        low_count = 0
+        max_height = None
+        min_height = None
+
+        now_tz = now.astimezone(user_tz)
+        today = now_tz.date()
+        _round = round  # local binding, skips a global lookup per iteration
+
+        # Single pass over extremes: build next_tides and the daily summary together
+        for tide in tide_data["extremes"]:
             dt = datetime.fromisoformat(tide["date"]).astimezone(user_tz)
-            processed_data["next_tides"].append({
-                "type": tide["type"].title(),
-                "height": round(tide.get("height", 0), 2),
-                "time": dt.strftime("%Y-%m-%d %H:%M:%S"),
-                "relative_time": get_relative_time(dt)
-            })
-        
-        # Calculate daily summary
-        high_tides = [t for t in tide_data["extremes"] if t["type"] == "High"]
-        low_tides = [t for t in tide_data["extremes"] if t["type"] == "Low"]
-        
+
+            if len(next_tides) < 6:  # Next 6 tides
+                next_tides.append({
+                    "type": tide["type"].title(),
+                    "type_tag": tide["type"].lower(),
+                    "height": _round(tide.get("height", 0), 2),
+                    "time": dt.strftime("%Y-%m-%d %H:%M:%S"),
+                    "relative_time": get_relative_time(dt, now_tz),
+                    "is_future": dt > now_tz
+                })
+
+            height = tide.get("height", 0)
+            if tide["type"] == "High":
+                if dt.date() == today:
+                    high_count += 1
+                if max_height is None or height > max_height:
+                    max_height = height
+            elif tide["type"] == "Low":
+                if dt.date() == today:
+                    low_count += 1
+                if min_height is None or height < min_height:
+                    min_height = height
+
         processed_data["daily_summary"] = {
-            "high_tides_count": len([t for t in high_tides if is_today(t["date"], user_tz)]),
-            "low_tides_count": len([t for t in low_tides if is_today(t["date"], user_tz)]),
-            "max_height": round(max([t.get("height", 0) for t in high_tides[:4]], default=0), 2),
-            "min_height": round(min([t.get("height", 0) for t in low_tides[:4]], default=0), 2)
+            "high_tides_count": high_count,
+            "low_tides_count": low_count,
+            "max_height": _round(max_height, 2) if max_height is not None else 0,
+            "min_height": _round(min_height, 2) if min_height is not None else 0
         }
-    
+
     return processed_data
 
+# Shared read-only sentinel so .get fallbacks don't allocate a dict per miss
+_EMPTY: Dict[str, Any] = {}
+
 def process_weather_data(weather_data: Dict) -> Dict[str, Any]:
     """Process and format weather data"""
     if not weather_data:
         return {}
-    
+
     current = weather_data.get("current", {})
     forecast = weather_data.get("forecast", {})
-    
+
     processed = {}
-    
+
     if current:
+        main = current.get("main") or _EMPTY
+        wind = current.get("wind") or _EMPTY
+        weather0 = (current.get("weather") or (_EMPTY,))[0]
+        visibility = current.get("visibility", 0)
         processed["current"] = {
-            "condition": current.get("weather", [{}])[0].get("description", "").title(),
-            "temperature": round(current.get("main", {}).get("temp", 0), 1),
-            "feels_like": round(current.get("main", {}).get("feels_like", 0), 1),
-            "humidity": current.get("main", {}).get("humidity", 0),
-            "pressure": current.get("main", {}).get("pressure", 0),
-            "visibility": current.get("visibility", 0) / 1000 if current.get("visibility") else None,
-            "wind_speed": current.get("wind", {}).get("speed", 0),
-            "wind_direction": current.get("wind", {}).get("deg", 0),
+            "condition": weather0.get("description", "").title(),
+            "temperature": round(main.get("temp", 0), 1),
+            "feels_like": round(main.get("feels_like", 0), 1),
+            "humidity": main.get("humidity", 0),
+            "pressure": main.get("pressure", 0),
+            "visibility": visibility / 1000 if visibility else None,
+            "wind_speed": wind.get("speed", 0),
+            "wind_direction": wind.get("deg", 0),
             "location_name": current.get("name", "")
         }
-    
+
     if forecast and "list" in forecast:
         processed["forecast"] = []
+        _round = round  # local binding, skips a global lookup per iteration
         for item in forecast["list"][:4]:  # Next 12 hours
+            item_main = item["main"]
+            item_wind = item["wind"]
+            rain = item.get("rain") or _EMPTY
+            snow = item.get("snow") or _EMPTY
             dt = datetime.fromtimestamp(item["dt"])
             processed["forecast"].append({
                 "time": dt.strftime("%H:%M"),
                 "condition": item["weather"][0]["description"].title(),
-                "temperature": round(item["main"]["temp"], 1),
-                "wind_speed": item["wind"]["speed"],
-                "precipitation": item.get("rain", {}).get("3h", 0) + item.get("snow", {}).get("3h", 0)
+                "temperature": _round(item_main["temp"], 1),
+                "wind_speed": item_wind["speed"],
+                "precipitation": rain.get("3h", 0) + snow.get("3h", 0)
             })
-    
+
     return processed
 
+# Minimum average suitability score for each overall rating, best first
+_RATING_BUCKETS = ((8, "Excellent"), (6, "Good"), (4, "Fair"), (0, "Poor"))
+
+def _overall_rating(avg_rating: float) -> str:
+    """Map an average suitability score to its rating label"""
+    for threshold, label in _RATING_BUCKETS:
+        if avg_rating >= threshold:
+            return label
+    return "Poor"
+
 def get_marine_conditions(weather_data: Dict, tide_data: Dict) -> Dict[str, Any]:
     """Analyze marine conditions for activities"""
     conditions = {
@@ -294,27 +388,21 @@ def get_marine_conditions(weather_data: Dict, tide_data: Dict) -> Dict[str, Any]
     temperature = current.get("temperature", 0)
     visibility = current.get("visibility", 10)
     
+    next_tides = tide_data.get("next_tides")
+    next_is_high = bool(next_tides) and next_tides[0]["type_tag"] == "high"
+    next_is_low_future = bool(next_tides) and next_tides[0]["type_tag"] == "low" and next_tides[0]["is_future"]
+
     # Rate conditions for different activities
-    conditions["suitability"] = {
-        "swimming": get_swimming_suitability(temperature, wind_speed),
-        "surfing": get_surfing_suitability(wind_speed, tide_data),
-        "fishing": get_fishing_suitability(wind_speed, tide_data),
-        "boating": get_boating_suitability(wind_speed, visibility)
-    }
-    
-    # Overall rating
-    ratings = list(conditions["suitability"].values())
-    avg_rating = sum(r for r in ratings if isinstance(r, (int, float))) / len(ratings) if ratings else 0
-    
-    if avg_rating >= 8:
-        conditions["overall_rating"] = "Excellent"
-    elif avg_rating >= 6:
-        conditions["overall_rating"] = "Good"
-    elif avg_rating >= 4:
-        conditions["overall_rating"] = "Fair"
-    else:
-        conditions["overall_rating"] = "Poor"
-    
+    suitability = score_suitability(
+        temperature, wind_speed, visibility, next_is_high, next_is_low_future
+    )
+    conditions["suitability"] = suitability
+
+    # Overall rating (score_suitability guarantees four numeric scores)
+    avg_rating = sum(suitability.values()) / len(suitability)
+    conditions["overall_rating"] = _overall_rating(avg_rating)
+
+
     # Add warnings
     if wind_speed > 10:
         conditions["warnings"].append("Strong winds - exercise caution")
@@ -338,22 +426,26 @@ def generate_recommendations(tide_data: Dict, weather_data: Dict, marine_conditi
         return recommendations
     
     next_tide = tide_data["next_tides"][0]
+    next_type = next_tide["type_tag"]
     current_weather = weather_data.get("current", {})
-    
-    # Determine best activity based on conditions
-    if marine_conditions.get("suitability", {}).get("surfing", 0) >= 7:
-        if next_tide["type"].lower() == "high":
+
+    # Determine best activity in fixed priority order (surfing, fishing,
+    # swimming, then beach walking) - boating intentionally has no branch
+    suitability = marine_conditions.get("suitability", {})
+
+    if suitability.get("surfing", 0) >= 7:
+        if next_type == "high":
             recommendations["best_activity"] = "Surfing"
             recommendations["tips"].append("High tide approaching - excellent surfing conditions")
-    elif marine_conditions.get("suitability", {}).get("fishing", 0) >= 7:
+    elif suitability.get("fishing", 0) >= 7:
         recommendations["best_activity"] = "Fishing"
-        if next_tide["type"].lower() == "low":
+        if next_type == "low":
             recommendations["tips"].append("Low tide period - fish often feed more actively")
-    elif marine_conditions.get("suitability", {}).get("swimming", 0) >= 6:
+    elif suitability.get("swimming", 0) >= 6:
         recommendations["best_activity"] = "Swimming"
     else:
         recommendations["best_activity"] = "Beach walking"
-        if next_tide["type"].lower() == "low":
+        if next_type == "low":
             recommendations["tips"].append("Low tide - great time for exploring tide pools")
     
     # Time recommendations
@@ -368,9 +460,8 @@ def generate_recommendations(tide_data: Dict, weather_data: Dict, marine_conditi
     return recommendations
 
 # Helper functions
-def get_relative_time(target_time: datetime) -> str:
+def get_relative_time(target_time: datetime, now: datetime) -> str:
     """Get human-readable relative time"""
-    now = datetime.now(target_time.tzinfo)
     diff = target_time - now
     
     if diff.total_seconds() < 0:
@@ -385,79 +476,73 @@ def get_relative_time(target_time: datetime) -> str:
         days = int(diff.total_seconds() / 86400)
         return f"In {days} days"
 
-def is_today(date_str: str, timezone) -> bool:
-    """Check if date is today in given timezone"""
-    try:
-        dt = datetime.fromisoformat(date_str).astimezone(timezone)
-        now = datetime.now(timezone)
-        return dt.date() == now.date()
-    except Exception:
-        return False
-
-def get_swimming_suitability(temperature: float, wind_speed: float) -> int:
-    """Rate swimming conditions (0-10)"""
-    score = 5
+def score_suitability(temperature: float, wind_speed: float, visibility: Optional[float],
+                      next_is_high: bool, next_is_low_future: bool) -> Dict[str, int]:
+    """Rate all four activities (0-10 each) in a single pass"""
+    swimming = 5
     if temperature > 20:
-        score += 2
+        swimming += 2
     if temperature > 25:
-        score += 2
+        swimming += 2
     if wind_speed < 5:
-        score += 1
+        swimming += 1
     if temperature < 15:
-        score -= 3
+        swimming -= 3
     if wind_speed > 15:
-        score -= 2
-    return max(0, min(10, score))
+        swimming -= 2
 
-def get_surfing_suitability(wind_speed: float, tide_data: Dict) -> int:
-    """Rate surfing conditions (0-10)"""
-    score = 5
+    surfing = 5
     if 5 <= wind_speed <= 15:
-        score += 2
-    if tide_data.get("next_tides") and tide_data["next_tides"][0]["type"].lower() == "high":
-        score += 2
+        surfing += 2
+    if next_is_high:
+        surfing += 2
     if wind_speed > 20:
-        score -= 3
-    return max(0, min(10, score))
+        surfing -= 3
 
-def get_fishing_suitability(wind_speed: float, tide_data: Dict) -> int:
-    """Rate fishing conditions (0-10)"""
-    score = 6
+    fishing = 6
     if wind_speed < 10:
-        score += 2
-    if tide_data.get("next_tides"):
-        next_tide = tide_data["next_tides"][0]
-        if next_tide["type"].lower() == "low" and "In" in next_tide.get("relative_time", ""):
-            score += 2
+        fishing += 2
+    if next_is_low_future:
+        fishing += 2
     if wind_speed > 15:
-        score -= 2
-    return max(0, min(10, score))
+        fishing -= 2
 
-def get_boating_suitability(wind_speed: float, visibility: Optional[float]) -> int:
-    """Rate boating conditions (0-10)"""
-    score = 6
+    boating = 6
     if wind_speed < 8:
-        score += 2
+        boating += 2
     if visibility and visibility > 5:
-        score += 2
+        boating += 2
     if wind_speed > 12:
-        score -= 3
+        boating -= 3
     if visibility and visibility < 2:
-        score -= 3
-    return max(0, min(10, score))
+        boating -= 3
+
+    return {
+        "swimming": max(0, min(10, swimming)),
+        "surfing": max(0, min(10, surfing)),
+        "fishing": max(0, min(10, fishing)),
+        "boating": max(0, min(10, boating))
+    }
+
+# Static endpoint bodies, built once (API keys don't change after .env load)
+_ROOT_BODY = {
+    "service": "Tide Information API",
+    "status": "operational",
+    "version": "2.0.0",
+    "endpoints": "/docs for API documentation"
+}
+_HEALTH_SERVICES = {
+    "tides_api": "configured" if TIDES_API_KEY else "missing_key",
+    "weather_api": "configured" if WEATHER_API_KEY else "missing_key"
+}
 
 # API Routes
 @app.get("/", response_model=Dict[str, str])
 def root():
     """API health check"""
-    return {
-        "service": "Tide Information API",
-        "status": "operational",
-        "version": "2.0.0",
-        "endpoints": "/docs for API documentation"
-    }
+    return _ROOT_BODY
 
-@app.get("/tides", response_model=TideResponse)
+@app.get("/tides")
 async def get_tides(
     lat: float = Query(..., ge=-90, le=90, description="Latitude in decimal degrees"),
     lon: float = Query(..., ge=-180, le=180, description="Longitude in decimal degrees"),
@@ -467,36 +552,38 @@ async def get_tides(
     Get comprehensive tide information including weather and activity recommendations
     """
     try:
+        # One timestamp per request, threaded through everything below
+        req_now = datetime.now(dt_timezone.utc)
+
         # Auto-detect timezone if not provided
         if not timezone:
             timezone = get_timezone_from_coords(lat, lon)
-        
+
         # Fetch data asynchronously
         tide_data_raw, weather_data_raw = await asyncio.gather(
-            fetch_tide_data(lat, lon),
+            fetch_tide_data(lat, lon, req_now),
             fetch_weather_data(lat, lon)
         )
-        
+
         # Process the data
-        tide_data = process_tide_data(tide_data_raw, timezone)
+        tide_data = process_tide_data(tide_data_raw, timezone, req_now)
         weather_data = process_weather_data(weather_data_raw)
         marine_conditions = get_marine_conditions(weather_data, tide_data)
         recommendations = generate_recommendations(tide_data, weather_data, marine_conditions)
         
-        # Build response
-        response = TideResponse(
-            lat=lat,
-            lon=lon,
-            location_name=weather_data.get("current", {}).get("location_name", ""),
-            next_tides=tide_data["next_tides"],
-            daily_summary=tide_data["daily_summary"],
-            weather=weather_data,
-            marine_conditions=marine_conditions,
-            recommendations=recommendations,
-            last_updated=datetime.now().isoformat()
-        )
-        
-        return response
+        # Build response (plain dict - skips pydantic re-validation of the
+        # nested payload; orjson serializes it directly)
+        return {
+            "lat": lat,
+            "lon": lon,
+            "location_name": weather_data.get("current", {}).get("location_name", ""),
+            "next_tides": tide_data["next_tides"],
+            "daily_summary": tide_data["daily_summary"],
+            "weather": weather_data,
+            "marine_conditions": marine_conditions,
+            "recommendations": recommendations,
+            "last_updated": req_now.isoformat()
+        }
         
     except Exception as e:
         logger.error(f"Error processing tide request: {e}")
@@ -508,15 +595,13 @@ def health_check():
     return {
         "status": "healthy",
         "timestamp": datetime.now().isoformat(),
-        "services": {
-            "tides_api": "configured" if TIDES_API_KEY else "missing_key",
-            "weather_api": "configured" if WEATHER_API_KEY else "missing_key"
-        },
-        "cache_entries": len(cache_store)
+        "services": _HEALTH_SERVICES,
+        "cache_entries": len(tide_cache) + len(weather_cache)
     }
 
 @app.post("/cache/clear")
 def clear_cache():
     """Clear API cache (useful for testing)"""
-    cache_store.clear()
+    tide_cache.clear()
+    weather_cache.clear()
     return {"message": "Cache cleared successfully"}